@@ -0,0 +1,240 @@
+# api/_bse_handler.py — shared app factory; api/bse.py just calls build_app()
+import orjson
+from fastapi import Depends, FastAPI, Query, Request, Response
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from typing import List, Dict, Optional
+from datetime import datetime, timedelta
+import asyncio
+import functools
+import gzip
+import hashlib
+import json
+import os
+import time
+from cachetools import TTLCache
+try:
+    from zoneinfo import ZoneInfo
+    IST = ZoneInfo("Asia/Kolkata")
+except Exception:
+    IST = None
+
+# scrapper_bse with its HTTP stack (httpx/h2), and redis below, are imported on first data
+# request, not at cold start: /healthz and CORS preflights only pay for FastAPI plus the
+# small orjson/cachetools modules.
+@functools.lru_cache(maxsize=1)
+def _fetch():
+    from scrapper_bse import fetch_announcements_async
+    return fetch_announcements_async
+
+@functools.lru_cache(maxsize=1)
+def _client_factory():
+    from scrapper_bse import make_async_client
+    return make_async_client
+
+_today_cache = [float("-inf"), ""]  # [computed_at (monotonic), "DD/MM/YYYY"]
+
+def today_ddmmyyyy_ist() -> str:
+    # Recomputed at most once per second; the date can't change faster than that.
+    # Monotonic clock: a wall-clock step back (NTP) must not keep a stale date alive
+    now = time.monotonic()
+    if now - _today_cache[0] < 1.0:
+        return _today_cache[1]
+    if IST:
+        d = datetime.now(IST).date()
+    else:
+        d = (datetime.utcnow() + timedelta(hours=5, minutes=30)).date()
+    s = d.strftime("%d/%m/%Y")
+    _today_cache[0], _today_cache[1] = now, s
+    return s
+
+MAX_ROWS = 200  # response cap
+
+# "Today" only moves every few minutes; serve repeats (as encoded JSON) from memory for 45s
+_cache: TTLCache = TTLCache(maxsize=256, ttl=45)
+_inflight: Dict[tuple, asyncio.Task] = {}
+
+async def _single_flight(key: tuple, build):
+    """Run build() at most once per key at a time; identical concurrent callers share its result."""
+    task = _inflight.get(key)
+    if task is None:
+        # Own task, not the leader's: cancelling whichever request started it can't
+        # hand CancelledError to everyone else waiting on the same scrape
+        task = asyncio.ensure_future(build())
+        _inflight[key] = task
+        task.add_done_callback(functools.partial(_inflight_done, key))
+    # shield: a disconnecting caller (leader or follower) must not cancel the shared scrape
+    return await asyncio.shield(task)
+
+def _inflight_done(key: tuple, task: asyncio.Task) -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    if not task.cancelled():
+        task.exception()  # mark retrieved: no "never retrieved" warning when every caller left
+
+# Shared across serverless instances when REDIS_URL is set; bump the prefix to invalidate everything
+REDIS_URL = os.getenv("REDIS_URL")
+REDIS_PREFIX = "v1:bse:"
+REDIS_TTL = 45
+
+@functools.lru_cache(maxsize=1)
+def _get_redis():
+    """Redis client, created on first use; None without REDIS_URL or the redis package."""
+    if not REDIS_URL:
+        return None
+    try:
+        import redis.asyncio as aioredis
+    except ImportError:
+        return None
+    return aioredis.Redis.from_url(REDIS_URL)
+
+async def _redis_get_rows(redis, cache_key: str) -> Optional[List[Dict]]:
+    try:
+        blob = await redis.get(cache_key)
+    except Exception:
+        return None
+    return json.loads(gzip.decompress(blob)) if blob else None
+
+async def _memo_fetch(params: Dict, fetch, status: Dict) -> List[Dict]:
+    """
+    Redis memoization of one scrape (gzip'd JSON rows); calls fetch() directly without Redis.
+    `status` is the dict fetch() reports a truncated crawl in.
+    """
+    redis = _get_redis()
+    if redis is None:
+        return await fetch()
+    cache_key = REDIS_PREFIX + hashlib.blake2b(
+        json.dumps(params, sort_keys=True).encode(), digest_size=16
+    ).hexdigest()
+
+    rows = await _redis_get_rows(redis, cache_key)
+    if rows is not None:
+        return rows
+
+    # Stampede guard across instances: whoever takes the lock scrapes, the rest poll briefly
+    try:
+        owner = await redis.set(cache_key + ":lock", b"1", nx=True, ex=10)
+    except Exception:
+        owner = True
+    if not owner:
+        for _ in range(20):
+            await asyncio.sleep(0.25)
+            rows = await _redis_get_rows(redis, cache_key)
+            if rows is not None:
+                return rows
+
+    rows = await fetch()
+    try:
+        # Empty or truncated results may just be a WAF block / failed page: don't pin them
+        # for every instance
+        if rows and not status.get("truncated"):
+            await redis.set(cache_key, gzip.compress(json.dumps(rows).encode()), ex=REDIS_TTL)
+        if owner:
+            await redis.delete(cache_key + ":lock")
+    except Exception:
+        pass
+    return rows
+
+async def get_client(request: Request):
+    # One pooled client per process, opened on first use: TLS sessions / HTTP/2
+    # connections are then reused across requests. async so the check-and-create
+    # runs on the event loop, not racing in the threadpool.
+    state = request.app.state
+    if getattr(state, "client", None) is None:
+        state.client = _client_factory()()
+    return state.client
+
+def build_app() -> FastAPI:
+    app = FastAPI(
+        title="BSE Announcements API — Today (IST)",
+        default_response_class=ORJSONResponse,
+    )
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_methods=["GET"],
+        allow_headers=["*"],
+    )
+    # 200 rows of headlines/URLs compress several-fold; small bodies (healthz) are left alone
+    app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=5)
+
+    @app.on_event("shutdown")
+    async def _close_client() -> None:
+        client = getattr(app.state, "client", None)
+        if client is not None:
+            await client.aclose()
+
+    @app.get("/")  # Final URL: /api/bse
+    async def today_only(
+        search: str = Query(""),
+        segment: str = Query("C"),
+        submission_type: str = Query("0"),
+        category: str = Query(""),
+        subcategory: str = Query(""),
+        max_pages: int = Query(2, ge=1, le=50),
+        diag: bool = Query(False, description="Return minimal diagnostics"),
+        client=Depends(get_client),
+    ):
+        fd = td = today_ddmmyyyy_ist()
+        key = (fd, segment, submission_type, category, subcategory, search, max_pages, diag)
+        cached = _cache.get(key)
+        if cached is not None:
+            return Response(cached, media_type="application/json")
+
+        async def _build() -> bytes:
+            status: Dict = {}  # truncation report of the latest _call
+
+            async def _call(fd_in: str, td_in: str, pages: int) -> List[Dict]:
+                params = dict(
+                    from_date=fd_in,
+                    to_date=td_in,
+                    segment=segment,
+                    submission_type=submission_type,
+                    category=category,
+                    subcategory=subcategory,
+                    search=search,
+                    max_pages=pages,
+                    max_rows=MAX_ROWS,
+                )
+                # Rows arrive already deduped; paging stops once the response cap is reached
+                status.clear()
+                return await _memo_fetch(
+                    params,
+                    lambda: _fetch()(**params, client=client, status=status, probe=False, verbose=False),
+                    status,
+                )
+
+            # First try: strict "today"
+            rows = await _call(fd, td, max_pages)
+
+            # Fallback: if nothing, retry with (today-1 .. today) and a bit more pages
+            if not rows:
+                y = (datetime.strptime(fd, "%d/%m/%Y") - timedelta(days=1)).strftime("%d/%m/%Y")
+                rows = await _call(y, td, max_pages + 2)
+
+            resp = {"date": fd, "count": len(rows), "rows": rows}
+            if diag:
+                resp["diag"] = {
+                    "segment": segment, "submission_type": submission_type,
+                    "category": category, "subcategory": subcategory,
+                    "search": search, "max_pages": max_pages,
+                    "first_row": (rows[0] if rows else None)
+                }
+            # Cache the encoded body so hits skip JSON serialization entirely. Empty or
+            # truncated results (a WAF block, a failed page) are not cached, so the next
+            # request retries the scrape.
+            payload = orjson.dumps(resp)
+            if rows and not status.get("truncated"):
+                _cache[key] = payload
+            return payload
+
+        # Stampede guard: concurrent identical requests share one scrape
+        return Response(await _single_flight(key, _build), media_type="application/json")
+
+    @app.get("/healthz")
+    def health():
+        return {"ok": True, "today_ist": today_ddmmyyyy_ist()}
+
+    return app
@@ -14,13 +14,24 @@ Notes:
 """
 
 from __future__ import annotations
+import argparse
+import asyncio
+import contextlib
 import datetime as dt
+import functools
+import itertools
 import json
+import os
 import sys
 import time
 import random
-from typing import Dict, List, Optional
-import requests
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import httpx
+from cachetools import TTLCache
+try:
+    import orjson  # much faster decode of the verbose announcement payloads
+except ImportError:
+    orjson = None
 
 # ---------- Constants ----------
 ANN_HTML = "https://www.bseindia.com/corporates/ann.html"
@@ -43,6 +54,7 @@ BROWSER_HEADERS = {
                    "Chrome/120.0.0.0 Safari/537.36"),
     "Accept": "application/json, text/javascript, */*; q=0.01",
     "Accept-Language": "en-US,en;q=0.9",
+    # No Accept-Encoding: httpx sends gzip/deflate, plus br only when brotli is importable
     "Cache-Control": "no-cache",
     "Pragma": "no-cache",
     "Referer": ANN_HTML,
@@ -51,14 +63,40 @@ BROWSER_HEADERS = {
     "Connection": "keep-alive",
 }
 
+# HTTP/2 forbids connection-specific headers; httpx manages keep-alive itself.
+ASYNC_HEADERS = {k: v for k, v in BROWSER_HEADERS.items() if k != "Connection"}
+
 DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y/%m/%d")
 
+# Stop paging when this share of a page's news_ids repeat the previous page
+PAGE_REPEAT_RATIO = 0.9
+
+# Cache-buster for API calls: unique and increasing per request, seeded from the clock
+_cb_counter = itertools.count(int(time.time() * 1000))
+
+# GET retries on throttling / transient upstream errors: 0.5s, 1s, 2s, 4s (+ jitter), capped.
+# The budget is per page, shared by all endpoint/variant combos it tries.
+PAGE_RETRIES = 4
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Only failures where the request never reached BSE; a read timeout is not retried
+RETRY_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+BACKOFF_BASE_SEC = 0.5
+BACKOFF_CAP_SEC = 8.0
+# Hard cap on one page, retries included (it holds a semaphore slot meanwhile)
+PAGE_DEADLINE_SEC = 15.0
+
 
 # ---------- Utilities ----------
 def to_site_date(s: Optional[str]) -> str:
     """Accept YYYY-MM-DD, DD/MM/YYYY, DD-MM-YYYY, YYYY/MM/DD → return DD/MM/YYYY. If empty, use today."""
     if not s:
+        # Not cached: "today" moves
         return dt.date.today().strftime("%d/%m/%Y")
+    return _parse_site_date(s)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_site_date(s: str) -> str:
     s = s.strip()
     for fmt in DATE_FORMATS:
         try:
@@ -69,52 +107,70 @@ def to_site_date(s: Optional[str]) -> str:
     raise ValueError(f"Invalid date: {s}")
 
 
-def _safe_get(d: Dict, *keys, default=None):
-    for k in keys:
-        if k in d and d[k] not in (None, ""):
-            return d[k]
-    return default
+def _loads(body: bytes):
+    return orjson.loads(body) if orjson else json.loads(body)
 
 
-def _make_pdf_url(row: Dict) -> Optional[str]:
-    att = _safe_get(row, "ATTACHMENTNAME", "ATTACHMENT", "FILE")
+# Output field -> source keys in priority order (first non-empty value wins).
+# The "_"-prefixed slots only feed pdf_url and are not part of the output.
+FIELD_ALIASES = (
+    ("datetime",    ("DT_TM", "DtTm", "NEWS_DT")),
+    ("scrip_code",  ("SCRIP_CD", "Scripcode", "scripcode")),
+    ("scrip_name",  ("S_LONGNAME", "SLONGNAME", "SCRIPNAME", "Scripname")),
+    ("headline",    ("NEWSSUB", "HEADLINE", "NEWS_SUB")),
+    ("category",    ("CATEGORYNAME", "CATEGORY")),
+    ("subcategory", ("SUBCATEGORYNAME", "SUBCAT")),
+    ("news_id",     ("NEWSID", "newsid")),
+    ("_attachment", ("ATTACHMENTNAME", "ATTACHMENT", "FILE")),
+    ("_pdfflag",    ("PDFFLAG", "pdfflag")),
+)
+
+
+def _make_pdf_url(att, pdfflag) -> Optional[str]:
     if not att:
         return None
     if isinstance(att, str) and att.lower().startswith("http"):
         return att
-    pdfflag = _safe_get(row, "PDFFLAG", "pdfflag", default=0)
     if str(pdfflag) == "1":
         return f"https://www.bseindia.com/xml-data/corpfiling/AttachHis/{att}"
     return f"https://www.bseindia.com/xml-data/corpfiling/AttachLive/{att}"
 
 
-def _make_detail_url(row: Dict) -> Optional[str]:
-    newsid = _safe_get(row, "NEWSID", "newsid")
-    scrip = str(_safe_get(row, "SCRIP_CD", "Scripcode", "scripcode", default="")).strip()
+def _make_detail_url(newsid, scrip) -> Optional[str]:
+    scrip = str(scrip if scrip is not None else "").strip()
     if newsid and scrip:
         return f"https://m.bseindia.com/MAnnDet.aspx?Form=STR&newsid={newsid}&scrpcd={scrip}"
     return None
 
 
 def normalize_row(r: Dict) -> Dict:
-    return {
-        "datetime":   _safe_get(r, "DT_TM", "DtTm", "NEWS_DT"),
-        "scrip_code": _safe_get(r, "SCRIP_CD", "Scripcode", "scripcode"),
-        "scrip_name": _safe_get(r, "S_LONGNAME", "SLONGNAME", "SCRIPNAME", "Scripname"),
-        "headline":   _safe_get(r, "NEWSSUB", "HEADLINE", "NEWS_SUB"),
-        "category":   _safe_get(r, "CATEGORYNAME", "CATEGORY"),
-        "subcategory": _safe_get(r, "SUBCATEGORYNAME", "SUBCAT"),
-        "news_id":    _safe_get(r, "NEWSID", "newsid"),
-        "pdf_url":    _make_pdf_url(r),
-        "detail_url": _make_detail_url(r),
-    }
+    # One table-driven pass: a single .get() per alias, stopping at the first hit
+    get = r.get
+    out = {}
+    for field, keys in FIELD_ALIASES:
+        val = None
+        for k in keys:
+            v = get(k)
+            if v is not None and v != "":
+                val = v
+                break
+        out[field] = val
+    att = out.pop("_attachment")
+    pdfflag = out.pop("_pdfflag")
+    out["pdf_url"] = _make_pdf_url(att, pdfflag if pdfflag is not None else 0)
+    out["detail_url"] = _make_detail_url(out["news_id"], out["scrip_code"])
+    return out
 
 
 def _extract_rows(payload: Dict) -> List[Dict]:
     """Handle common shapes: {Table:[...]}, {data:[...]}, {"d":{"Table":[...]}}."""
     if not isinstance(payload, dict):
         return []
-    for key in ("Table", "table", "data", "Data"):
+    # Fast path: BSE nearly always answers with "Table"
+    rows = payload.get("Table")
+    if isinstance(rows, list):
+        return rows
+    for key in ("table", "data", "Data"):
         val = payload.get(key)
         if isinstance(val, list):
             return val
@@ -124,28 +180,6 @@ def _extract_rows(payload: Dict) -> List[Dict]:
     return []
 
 
-def _session(verbose: bool = False) -> requests.Session:
-    s = requests.Session()
-    s.headers.update(BROWSER_HEADERS)
-    # Warm base page (sets cookies like ASP.NET_SessionId, WAF tokens)
-    try:
-        r = s.get(ANN_HTML, timeout=15)
-        if verbose:
-            print(f"[probe] GET ann.html → {r.status_code}", file=sys.stderr)
-    except requests.RequestException as e:
-        if verbose:
-            print(f"[probe] ann.html error: {e}", file=sys.stderr)
-    # Touch a couple of static assets (some WAFs set/refresh cookies here)
-    for url in WARM_ASSETS:
-        try:
-            r = s.get(url, timeout=10)
-            if verbose:
-                print(f"[probe] warm {url} → {r.status_code}", file=sys.stderr)
-        except requests.RequestException:
-            pass
-    return s
-
-
 def _param_variants(segment, subm, f_ddmmyyyy, t_ddmmyyyy, page, search, category, subcategory):
     base = {
         "strCat": category or "-1",
@@ -164,39 +198,132 @@ def _param_variants(segment, subm, f_ddmmyyyy, t_ddmmyyyy, page, search, categor
     return [v1, v2, v3]
 
 
-def _try_request(sess: requests.Session, url: str, params: Dict, probe=False, verbose=False):
-    # Add a cache-buster & small backoff jitter
-    params = dict(params)
-    params["_"] = str(int(time.time() * 1000)) + str(random.randint(100, 999))
+def _combos(n_variants: int, preferred: Optional[Tuple[str, int]] = None) -> List[Tuple[str, int]]:
+    """(endpoint, variant index) pairs in try order; the last combo that worked goes first."""
+    combos = [(url, i) for url in ENDPOINTS for i in range(n_variants)]
+    if preferred in combos:
+        combos.remove(preferred)
+        combos.insert(0, preferred)
+    return combos
+
+
+# ---------- Fetching (httpx, async) ----------
+def make_async_client() -> httpx.AsyncClient:
+    """
+    Pooled HTTP/2 client meant to be created once and shared across calls.
+    Pool size: HTTPX_MAX_CONNECTIONS / HTTPX_MAX_KEEPALIVE_CONNECTIONS env vars; idle
+    connections are kept for HTTPX_KEEPALIVE_EXPIRY seconds (default 75, vs httpx's 5)
+    so requests a few seconds apart still reuse a warm TLS/HTTP2 connection.
+    Timeouts are tight so one slow BSE page fails fast instead of pinning a worker;
+    failed connects are retried twice (with backoff) by the transport.
+    """
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("HTTPX_MAX_CONNECTIONS", "200")),
+        max_keepalive_connections=int(os.getenv("HTTPX_MAX_KEEPALIVE_CONNECTIONS", "100")),
+        keepalive_expiry=float(os.getenv("HTTPX_KEEPALIVE_EXPIRY", "75")),
+    )
+    # http2/limits must be set on the transport itself when one is passed explicitly
+    transport = httpx.AsyncHTTPTransport(http2=True, limits=limits, retries=2)
+    return httpx.AsyncClient(
+        headers=ASYNC_HEADERS,
+        follow_redirects=True,
+        transport=transport,
+        # connect just over 3s: lets a retransmitted SYN (3s RTO) still land before giving up
+        timeout=httpx.Timeout(connect=3.05, read=10.0, write=5.0, pool=5.0),
+    )
+
+
+# ETag / Last-Modified seen per warm-up URL, replayed as If-None-Match / If-Modified-Since
+_warm_validators: Dict[str, Dict[str, str]] = {}
 
-    # GET first
+
+async def _warm_async(client: httpx.AsyncClient, verbose: bool = False) -> None:
+    """Warm the client's cookie jar (ASP.NET_SessionId, WAF tokens) before hitting the API."""
+
+    async def _get(url: str) -> None:
+        # Conditional GET: unchanged pages/assets come back as a bodiless 304 (cookies still set)
+        validators = _warm_validators.get(url, {})
+        headers = {}
+        if "etag" in validators:
+            headers["If-None-Match"] = validators["etag"]
+        if "last-modified" in validators:
+            headers["If-Modified-Since"] = validators["last-modified"]
+        try:
+            r = await client.get(url, headers=headers)
+            if verbose:
+                print(f"[probe] warm {url} → {r.status_code}", file=sys.stderr)
+            if r.status_code == 200:
+                _warm_validators[url] = {
+                    k: r.headers[k] for k in ("etag", "last-modified") if k in r.headers
+                }
+        except httpx.HTTPError as e:
+            if verbose:
+                print(f"[probe] warm {url} error: {e}", file=sys.stderr)
+
+    # Base page + a couple of static assets (some WAFs set/refresh cookies there);
+    # independent requests, so fetch them concurrently
+    await asyncio.gather(*(_get(url) for url in (ANN_HTML, *WARM_ASSETS)))
+
+
+def _retry_after(r: httpx.Response) -> float:
+    """Seconds from a numeric Retry-After header; 0 if absent or an HTTP-date."""
     try:
-        r = sess.get(url, params=params, timeout=25)
-        if probe:
-            print(f"[probe] GET {url} → {r.status_code}", file=sys.stderr)
-        if r.ok:
-            try:
-                return r.json()
-            except Exception:
-                if probe:
-                    print(f"[probe] GET non-JSON: {r.text[:300]!r}", file=sys.stderr)
-    except Exception as e:
-        if probe:
-            print(f"[probe] GET error: {e}", file=sys.stderr)
+        return max(0.0, float(r.headers.get("Retry-After", 0)))
+    except ValueError:
+        return 0.0
+
+
+class _PageFailed(Exception):
+    """BSE gave no usable answer for a page: retries spent, or no endpoint returned JSON."""
+
 
-    # POST fallback (form-encoded)
+async def _try_request_async(
+    client: httpx.AsyncClient, url: str, params: Dict, budget: List[int], probe=False, verbose=False
+):
+    # GET first; back off and retry while the WAF throttles or the connection fails.
+    # `budget` is the page's one-slot retry allowance; once it is spent, the page gives up
+    # instead of moving on to the next combo.
+    attempt = 0
+    while True:
+        wait = min(BACKOFF_CAP_SEC, BACKOFF_BASE_SEC * (2 ** attempt)) + random.uniform(0, 0.25)
+        try:
+            r = await client.get(url, params=params)
+        except RETRY_ERRORS as e:
+            if probe:
+                print(f"[probe] GET error: {e}", file=sys.stderr)
+        except Exception as e:
+            # Read timeout, decoding error, ...: another attempt (or the POST) would fare no better
+            if probe:
+                print(f"[probe] GET error: {e}", file=sys.stderr)
+            return None
+        else:
+            if probe:
+                print(f"[probe] GET {url} → {r.status_code}", file=sys.stderr)
+            # Empty 200s (a soft WAF block) skip the decode attempt
+            if r.is_success and r.content:
+                try:
+                    return _loads(r.content)
+                except Exception:
+                    if probe:
+                        print(f"[probe] GET non-JSON: {r.text[:300]!r}", file=sys.stderr)
+                break
+            if r.is_success or r.status_code not in RETRY_STATUSES:
+                break
+            wait = max(wait, min(BACKOFF_CAP_SEC, _retry_after(r)))
+        if budget[0] <= 0:
+            raise _PageFailed(f"{url}: retries exhausted")
+        budget[0] -= 1
+        attempt += 1
+        await asyncio.sleep(wait)
+
+    # POST fallback (form-encoded; httpx sets the Content-Type for `data=`)
     try:
-        r = sess.post(
-            url,
-            data=params,
-            timeout=25,
-            headers={"Content-Type": "application/x-www-form-urlencoded; charset=UTF-8"},
-        )
+        r = await client.post(url, data=params)
         if probe:
             print(f"[probe] POST {url} → {r.status_code}", file=sys.stderr)
-        if r.ok:
+        if r.is_success and r.content:
             try:
-                return r.json()
+                return _loads(r.content)
             except Exception:
                 if probe:
                     print(f"[probe] POST non-JSON: {r.text[:300]!r}", file=sys.stderr)
@@ -207,7 +334,52 @@ def _try_request(sess: requests.Session, url: str, params: Dict, probe=False, ve
     return None
 
 
-def fetch_announcements(
+async def _fetch_page_async(
+    client: httpx.AsyncClient,
+    sem: asyncio.Semaphore,
+    page: int,
+    templates: List[Dict],
+    preferred: List[Optional[Tuple[str, int]]],
+    verbose: bool = False,
+    probe: bool = False,
+) -> List[Dict]:
+    """
+    Fetch one page; returns the raw rows from the first endpoint/variant that has any.
+    An empty list means BSE answered with no rows. Raises _PageFailed / TimeoutError if
+    no endpoint answered, or BSE kept failing past the retry budget or PAGE_DEADLINE_SEC.
+    `templates` are the crawl's _param_variants(); only pageno and the cache-buster
+    change per request. `preferred` is a one-slot holder shared by all pages of a
+    crawl for the winning combo.
+    """
+    budget = [PAGE_RETRIES]
+    answered = False
+    async with sem, asyncio.timeout(PAGE_DEADLINE_SEC):
+        for url, idx in _combos(len(templates), preferred[0]):
+            params = templates[idx].copy()
+            params["pageno"] = str(page)
+            params["_"] = str(next(_cb_counter))
+            if verbose:
+                print(f"[debug] try page={page} url={url} params={params}", file=sys.stderr)
+            payload = await _try_request_async(client, url, params, budget, probe=probe, verbose=verbose)
+            if payload is None:
+                continue
+            answered = True
+            rows_raw = _extract_rows(payload)
+            if verbose:
+                print(f"[debug] rows={len(rows_raw)}", file=sys.stderr)
+            if rows_raw:
+                preferred[0] = (url, idx)
+                return rows_raw
+            # The combo that has served rows in this crawl says there is no more data:
+            # believe it. Other combos are only a fallback for when it stops answering.
+            if (url, idx) == preferred[0]:
+                return []
+    if not answered:
+        raise _PageFailed(f"page {page}: no endpoint answered")
+    return []
+
+
+async def iter_announcements(
     from_date: str,
     to_date: str,
     *,
@@ -217,96 +389,243 @@ def fetch_announcements(
     subcategory: str = "",
     search: str = "",
     max_pages: int = 30,
-    delay_sec: float = 0.25,
+    concurrency: int = 6,
+    window: int = 8,
+    client: Optional[httpx.AsyncClient] = None,
     verbose: bool = False,
     probe: bool = False,
-) -> List[Dict]:
+    status: Optional[Dict] = None,
+) -> AsyncIterator[Dict]:
     """
-    Core fetcher. Returns a list of normalized dicts.
+    Stream normalized rows, deduped by news_id, in page order. Pages are requested
+    concurrently (at most `concurrency` in flight, and never more than `window` pages
+    ahead of the one being emitted); closing the generator early (e.g. via
+    contextlib.aclosing) cancels the pages still pending.
+    Pass a long-lived `client` (see make_async_client) to reuse its connection
+    pool; otherwise a throwaway one is opened for this call.
+    If a `status` dict is given, status["truncated"] is set when the stream ended on a
+    page that failed (errors, throttling) rather than on a genuine last page.
     """
     f = to_site_date(from_date)
     t = to_site_date(to_date)
-    sess = _session(verbose=probe)
-
-    all_rows: List[Dict] = []
-    page = 1
-
-    while page <= max_pages:
-        got_any = False
-        for url in ENDPOINTS:
-            for params in _param_variants(
-                segment, submission_type, f, t, page, search, category, subcategory
-            ):
-                if verbose:
-                    print(f"[debug] try page={page} url={url} params={params}", file=sys.stderr)
-                payload = _try_request(sess, url, params, probe=probe, verbose=verbose)
-                if not payload:
-                    continue
-                rows_raw = _extract_rows(payload)
-                if verbose:
-                    print(f"[debug] rows={len(rows_raw)}", file=sys.stderr)
-                if rows_raw:
-                    all_rows.extend(normalize_row(r) for r in rows_raw)
-                    got_any = True
-                    # Heuristic: typical page size ~20 — smaller => last page
-                    if len(rows_raw) < 20:
-                        return all_rows
-        if not got_any:
-            break
-        page += 1
-        if delay_sec:
-            time.sleep(delay_sec)
-
-    return all_rows
+    # Built once per crawl; pages only differ in pageno
+    templates = _param_variants(segment, submission_type, f, t, 1, search, category, subcategory)
+    seen = set()
+    mark_seen = seen.add  # bound once: the dedup loop runs per row
+
+    async with contextlib.AsyncExitStack() as stack:
+        if client is None:
+            client = await stack.enter_async_context(make_async_client())
+        await _warm_async(client, verbose=probe)
+        sem = asyncio.Semaphore(concurrency)
+        preferred: List[Optional[Tuple[str, int]]] = [None]
+        tasks: Dict[int, asyncio.Future] = {}
+        page_of: Dict[asyncio.Future, int] = {}
+        pending = set()
+        ready: Dict[int, List[Dict]] = {}
+        last_page = max_pages  # pages past this are known to be unnecessary
+        next_page = 1
+        prev_ids: set = set()  # news_ids of the last emitted page
+        failed: set = set()  # pages whose fetch raised
+
+        def _schedule() -> None:
+            # Slide the window forward; nothing is issued past a known last page. No look-ahead
+            # until some combo has served rows: before that every page scans all combos, and
+            # pages past the end would do so for nothing.
+            ahead = window if preferred[0] is not None else 1
+            for page in range(len(tasks) + 1, min(last_page, next_page + ahead - 1) + 1):
+                task = asyncio.ensure_future(
+                    _fetch_page_async(
+                        client, sem, page, templates, preferred, verbose=verbose, probe=probe
+                    )
+                )
+                tasks[page] = task
+                page_of[task] = page
+                pending.add(task)
 
+        try:
+            _schedule()
+            # Handle pages as they complete, but emit rows strictly in page order
+            while pending and next_page <= last_page:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    page = page_of[task]
+                    try:
+                        rows_raw = task.result()
+                    except Exception as e:
+                        if verbose:
+                            print(f"[debug] page={page} failed: {e!r}", file=sys.stderr)
+                        rows_raw = []
+                        failed.add(page)
+                    ready[page] = rows_raw
+                    # An empty/failed/short page ends pagination: drop later pages right away
+                    # instead of waiting for the earlier ones to reveal it
+                    if page < last_page and len(rows_raw) < 20:
+                        last_page = page
+                        for later in range(page + 1, len(tasks) + 1):
+                            tasks[later].cancel()
+                            pending.discard(tasks[later])
+
+                while next_page in ready:
+                    rows_raw = ready.pop(next_page)
+                    if next_page in failed:
+                        if status is not None:
+                            status["truncated"] = True
+                        return
+                    fresh = 0
+                    page_ids = set()
+                    for raw in rows_raw:
+                        row = normalize_row(raw)
+                        nid = row["news_id"]
+                        if not nid:
+                            continue
+                        page_ids.add(nid)
+                        if nid not in seen:
+                            mark_seen(nid)
+                            fresh += 1
+                            yield row
+                    # Heuristic: typical page size ~20 — smaller (or empty) => last page.
+                    # A full page with nothing new means BSE is re-serving an earlier page.
+                    if len(rows_raw) < 20 or not fresh:
+                        return
+                    # Pagination "looping": this page is (almost) the previous one again
+                    if len(page_ids & prev_ids) >= PAGE_REPEAT_RATIO * len(page_ids):
+                        return
+                    prev_ids = page_ids
+                    next_page += 1
+                _schedule()
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+
+# Finished crawls of windows that can no longer change
+_results_cache: TTLCache = TTLCache(maxsize=128, ttl=60)
+# Arguments that change what a crawl returns (client/verbosity/pacing don't)
+_RESULT_KEY_ARGS = ("segment", "submission_type", "category", "subcategory", "max_pages")
+
+
+def _results_key(from_date: str, to_date: str, max_rows: Optional[int], kwargs: Dict) -> Optional[tuple]:
+    """Cache key for a crawl, or None if its result may still change (search, or window reaching today)."""
+    if kwargs.get("search"):
+        return None
+    t = to_site_date(to_date)
+    if dt.datetime.strptime(t, "%d/%m/%Y").date() >= dt.date.today():
+        return None
+    return (
+        to_site_date(from_date),
+        t,
+        max_rows,
+        tuple((k, kwargs[k]) for k in _RESULT_KEY_ARGS if k in kwargs),
+    )
 
-# ---------- CLI ----------
-def _arg(flag: str, default: Optional[str] = None) -> Optional[str]:
-    if flag in sys.argv:
-        i = sys.argv.index(flag)
-        if i + 1 < len(sys.argv):
-            return sys.argv[i + 1]
-    return default
 
+async def fetch_announcements_async(
+    from_date: str,
+    to_date: str,
+    *,
+    max_rows: Optional[int] = None,
+    status: Optional[Dict] = None,
+    **kwargs,
+) -> List[Dict]:
+    """
+    List form of iter_announcements() (same keyword arguments); rows are unique by news_id.
+    With `max_rows`, paging stops as soon as that many unique rows are in hand.
+    Closed historical windows are served from a 60s in-process cache.
+    `status` is filled in as by iter_announcements(), so callers can tell a truncated crawl.
+    """
+    key = _results_key(from_date, to_date, max_rows, kwargs)
+    if key is not None:
+        cached = _results_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+    rows: List[Dict] = []
+    if status is None:
+        status = {}
+    stream = iter_announcements(from_date, to_date, status=status, **kwargs)
+    async with contextlib.aclosing(stream):
+        async for row in stream:
+            rows.append(row)
+            if max_rows is not None and len(rows) >= max_rows:
+                break
+    # Empty results may just mean the WAF blocked us, and a failed page cuts the crawl
+    # short; don't pin either
+    if key is not None and rows and not status.get("truncated"):
+        _results_cache[key] = list(rows)
+    return rows
 
-def _bool(flag: str) -> bool:
-    return flag in sys.argv
 
+def fetch_announcements(
+    from_date: str,
+    to_date: str,
+    *,
+    segment: str = "C",
+    submission_type: str = "0",
+    category: str = "",
+    subcategory: str = "",
+    search: str = "",
+    max_pages: int = 30,
+    delay_sec: float = 0.25,
+    verbose: bool = False,
+    probe: bool = False,
+) -> List[Dict]:
+    """
+    Core fetcher (blocking). Thin wrapper that runs fetch_announcements_async() on a
+    fresh event loop; rows are normalized and unique by news_id.
+    `delay_sec` is accepted for compatibility only — pacing is now bounded by the
+    async fetcher's concurrency limit.
+    """
+    return asyncio.run(
+        fetch_announcements_async(
+            from_date,
+            to_date,
+            segment=segment,
+            submission_type=submission_type,
+            category=category,
+            subcategory=subcategory,
+            search=search,
+            max_pages=max_pages,
+            verbose=verbose,
+            probe=probe,
+        )
+    )
 
-if __name__ == "__main__":
+
+# ---------- CLI ----------
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     today = dt.date.today()
-    from_default = (today - dt.timedelta(days=6)).strftime("%Y-%m-%d")
-    to_default = today.strftime("%Y-%m-%d")
-
-    from_d = _arg("--from", from_default)
-    to_d   = _arg("--to", to_default)
-    segment = _arg("--segment", "C")
-    subm    = _arg("--subm", "0")
-    cat     = _arg("--cat", "")
-    subcat  = _arg("--subcat", "")
-    search  = _arg("--search", "")
-    verbose = _bool("--verbose")
-    probe   = _bool("--probe")
+    p = argparse.ArgumentParser(description="BSE Corporate Announcements via API")
+    p.add_argument("--from", dest="from_d", default=(today - dt.timedelta(days=6)).strftime("%Y-%m-%d"))
+    p.add_argument("--to", dest="to_d", default=today.strftime("%Y-%m-%d"))
+    p.add_argument("--segment", default="C")
+    p.add_argument("--subm", default="0")
+    p.add_argument("--cat", default="")
+    p.add_argument("--subcat", default="")
+    p.add_argument("--search", default="")
+    p.add_argument("--verbose", action="store_true")
+    p.add_argument("--probe", action="store_true", help="print upstream statuses to stderr")
+    return p.parse_args(argv)
+
+
+if __name__ == "__main__":
+    ns = _parse_args()
 
     data = fetch_announcements(
-        from_date=from_d,
-        to_date=to_d,
-        segment=segment,
-        submission_type=subm,
-        category=cat,
-        subcategory=subcat,
-        search=search,
-        verbose=verbose,
-        probe=probe,
+        from_date=ns.from_d,
+        to_date=ns.to_d,
+        segment=ns.segment,
+        submission_type=ns.subm,
+        category=ns.cat,
+        subcategory=ns.subcat,
+        search=ns.search,
+        verbose=ns.verbose,
+        probe=ns.probe,
     )
 
-    # De-dup by news_id
-    seen, dedup = set(), []
-    for r in data:
-        nid = r.get("news_id")
-        if not nid or nid in seen:
-            continue
-        seen.add(nid)
-        dedup.append(r)
-
-    print(json.dumps({"count": len(dedup), "rows": dedup[:50]}, ensure_ascii=False, indent=2))
+    # Already unique by news_id (deduped while streaming)
+    out = {"count": len(data), "rows": data[:50]}
+    if orjson:
+        sys.stdout.buffer.write(orjson.dumps(out, option=orjson.OPT_INDENT_2) + b"\n")
+    else:
+        print(json.dumps(out, ensure_ascii=False, indent=2))
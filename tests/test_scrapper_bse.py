@@ -0,0 +1,50 @@
+import asyncio
+import urllib.parse
+from collections import Counter
+
+import httpx
+
+import scrapper_bse
+
+
+def _crawl(full_pages: int, **kwargs):
+    """Crawl against a mock BSE serving `full_pages` pages of 20 rows, then empty pages."""
+    scrapper_bse._results_cache.clear()
+    calls = Counter()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host != "api.bseindia.com":
+            return httpx.Response(200, text="ok")  # cookie warm-up
+        await asyncio.sleep(0.01)  # let concurrent pages overlap
+        params = dict(request.url.params)
+        params.update(urllib.parse.parse_qsl(request.content.decode()))
+        page = int(params["pageno"])
+        calls[page] += 1
+        rows = [{"NEWSID": f"{page}-{i}"} for i in range(20)] if page <= full_pages else []
+        return httpx.Response(200, json={"Table": rows})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await scrapper_bse.fetch_announcements_async(
+                "2025-01-01", "2025-01-01", client=client, **kwargs
+            )
+
+    return asyncio.run(run()), calls
+
+
+def test_crawl_ending_on_empty_page_sends_one_request_per_page():
+    rows, calls = _crawl(3, max_pages=30, concurrency=6, window=8)
+    assert len(rows) == 60
+    # Every page, speculative ones included, is answered by the known-good combo alone
+    assert set(calls.values()) == {1}
+    # Look-ahead past the empty page 4 is bounded by the concurrency limit
+    assert sum(calls.values()) <= 3 + 6
+
+
+def test_empty_crawl_does_not_look_ahead():
+    rows, calls = _crawl(0, max_pages=30)
+    assert rows == []
+    # Page 1 scans every endpoint/variant combo once; no other page is requested
+    assert list(calls) == [1]
+    variants = scrapper_bse._param_variants("C", "0", "01/01/2025", "01/01/2025", 1, "", "", "")
+    assert calls[1] == len(scrapper_bse._combos(len(variants)))